@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-import io
+from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from fastapi import FastAPI, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
-from .draw import draw_synthesis_tree
+from .draw import IMAGE_MEDIA_TYPES, draw_synthesis_tree
 from .parser import parse_synthesis
 
 app = FastAPI(title="Synthesis Path Visualization")
@@ -20,9 +21,10 @@ templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
 
 class VisualizeRequest(BaseModel):
     text: str
-    rankdir: str = "LR"
+    rankdir: Literal["LR", "TB", "RL", "BT"] = "LR"
     node_image_size: int = 200
     dpi: int = 200
+    format: Literal["png", "svg"] = "png"
 
 
 @app.get("/")
@@ -30,20 +32,33 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+# Plain ``def`` so FastAPI runs the CPU-bound render in its threadpool
+# instead of blocking the event loop
 @app.post("/visualize")
-async def visualize(req: VisualizeRequest):
-    nodes = parse_synthesis(req.text)
+def visualize(req: VisualizeRequest):
+    image = _render_image(req.text, req.rankdir, req.node_image_size, req.dpi, req.format)
+    if image is None:
+        return Response(b"", media_type="text/plain", status_code=400)
+    # Sent whole rather than streamed from dot: the image is cached and (for PNG)
+    # quantized, both of which need the complete output, and dot only emits it
+    # once layout is finished anyway
+    return Response(image, media_type=IMAGE_MEDIA_TYPES[req.format])
+
+
+@lru_cache(maxsize=128)
+def _render_image(text: str, rankdir: str, node_image_size: int, dpi: int, fmt: str) -> bytes | None:
+    """Parse and render synthesis text to PNG or SVG bytes, or None if it has no nodes.
+
+    Memoized so repeated requests for the same pathway skip the whole pipeline.
+    """
+    nodes = parse_synthesis(text)
     if not nodes:
-        return StreamingResponse(io.BytesIO(b""), media_type="text/plain", status_code=400)
+        return None
 
-    img = draw_synthesis_tree(
+    return draw_synthesis_tree(
         nodes,
-        node_image_size=req.node_image_size,
-        rankdir=req.rankdir,
-        dpi=req.dpi,
+        node_image_size=node_image_size,
+        rankdir=rankdir,
+        dpi=dpi,
+        fmt=fmt,
     )
-
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
@@ -2,67 +2,254 @@
 
 from __future__ import annotations
 
+import base64
 import io
+import multiprocessing
+import re
+import subprocess
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import repeat
 
 import PIL.Image
-import pydot
 from rdkit import Chem
-from rdkit.Chem import Draw
+from rdkit.Chem import Draw, rdDepictor
 
 from .models import BuildingBlock, ReactionNode
 
+# MIME types of the supported image formats, for both molecules and whole trees
+IMAGE_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
 
-def draw_molecule(smiles: str, size: int = 200) -> PIL.Image.Image | None:
-    """Render a SMILES string as a transparent-background PNG image."""
-    mol = Chem.MolFromSmiles(smiles)
+# Palette size for the final PNG; tree renders use only a handful of colours
+_PNG_PALETTE_COLORS = 64
+
+# LRU cache of rendered molecules keyed on (smiles, size, fmt). Kept explicit
+# rather than via lru_cache so batch renders can look up hits before sending
+# only the misses to the process pool.
+_MOLECULE_CACHE_SIZE = 512
+_molecule_cache: OrderedDict[tuple[str, int, str], bytes | None] = OrderedDict()
+_molecule_cache_lock = threading.Lock()
+
+# Process pool for batch molecule renders, see _get_executor(). The pool is
+# disabled for good if it breaks before completing any batch, which means
+# workers cannot start at all (e.g. an unguarded __main__ script).
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_executor_has_worked = False
+_executor_disabled = False
+
+
+def draw_molecule(smiles: str, size: int = 200, fmt: str = "png") -> bytes | None:
+    """Render a SMILES string as a transparent-background PNG or SVG image.
+
+    Results are memoized on ``(smiles, size, fmt)``: synthesis trees often
+    repeat the same molecule (shared intermediates, reused building blocks), so
+    each distinct molecule is only drawn once.
+    """
+    key = (smiles, size, fmt)
+    hit, image = _cache_lookup(key)
+    if not hit:
+        image = _render_molecule(smiles, size, fmt)
+        _cache_store(key, image)
+    return image
+
+
+def _cache_lookup(key: tuple[str, int, str]) -> tuple[bool, bytes | None]:
+    """Look up a rendered molecule. Returns ``(hit, image)``."""
+    with _molecule_cache_lock:
+        if key not in _molecule_cache:
+            return False, None
+        _molecule_cache.move_to_end(key)
+        return True, _molecule_cache[key]
+
+
+def _cache_store(key: tuple[str, int, str], image: bytes | None) -> None:
+    """Store a rendered molecule, evicting the least recently used entry if full."""
+    with _molecule_cache_lock:
+        _molecule_cache[key] = image
+        _molecule_cache.move_to_end(key)
+        if len(_molecule_cache) > _MOLECULE_CACHE_SIZE:
+            _molecule_cache.popitem(last=False)
+
+
+def _render_molecule(smiles: str, size: int, fmt: str) -> bytes | None:
+    """Render a SMILES string without consulting the cache. Runs in pool workers."""
+    mol = _mol_from_smiles(smiles)
     if mol is None:
         return None
 
-    d2d = Draw.MolDraw2DCairo(size, size)
-    opts = d2d.drawOptions()
+    if fmt == "png":
+        d2d = Draw.MolDraw2DCairo(size, size)
+    elif fmt == "svg":
+        d2d = Draw.MolDraw2DSVG(size, size)
+    else:
+        raise ValueError(f"Unsupported image format: {fmt!r}")
+    d2d.SetDrawOptions(_draw_options())
+    d2d.DrawMolecule(mol)
+    d2d.FinishDrawing()
+    data = d2d.GetDrawingText()
+    if fmt == "svg":
+        # Encode to match the document's declared encoding='iso-8859-1'
+        return _double_quote_svg_size(data).encode("iso-8859-1", errors="xmlcharrefreplace")
+    return data
+
+
+def _double_quote_svg_size(svg: str) -> str:
+    """Rewrite the root element's size attributes from single to double quotes.
+
+    RDKit quotes attributes with ``'``, but graphviz only reads an SVG image's
+    size from ``name="value"`` attributes and would otherwise lay it out as 0x0.
+    """
+    start = svg.find("<svg")
+    end = svg.find(">", start)
+    if start < 0 or end < 0:
+        return svg
+    root = re.sub(r"\b(width|height|viewBox)='([^']*)'", r'\1="\2"', svg[start:end])
+    return svg[:start] + root + svg[end:]
+
+
+@lru_cache(maxsize=1024)
+def _mol_from_smiles(smiles: str) -> Chem.Mol | None:
+    """Parse a SMILES string and compute its 2D depiction, memoized across sizes."""
+    mol = Chem.MolFromSmiles(smiles)
+    if mol is not None:
+        rdDepictor.Compute2DCoords(mol)
+    return mol
+
+
+@lru_cache(maxsize=1)
+def _draw_options() -> Draw.MolDrawOptions:
+    """Return the drawing options shared by every molecule render."""
+    opts = Draw.MolDrawOptions()
     opts.setBackgroundColour((1, 1, 1, 0))
     opts.setAtomPalette({0: (0.0, 0.0, 0.0)})
     opts.minFontSize = 20
-    d2d.DrawMolecule(mol)
-    d2d.FinishDrawing()
-    img_data = d2d.GetDrawingText()
-    return PIL.Image.open(io.BytesIO(img_data))
+    return opts
 
 
-def _make_node(
-    tmpdir: str,
-    node_name: str,
-    image: PIL.Image.Image | None,
-    annots: dict[str, str | None],
-    fontname: str,
-) -> pydot.Node:
-    """Create a pydot node with an HTML label containing an image and annotations."""
-    label_lines = [
-        "<",
-        '<TABLE STYLE="ROUNDED" BORDER="0" CELLBORDER="0" CELLSPACING="5" CELLPADDING="0" BGCOLOR="grey97">',
-    ]
-    if image is not None:
-        im_path = f"{tmpdir}/{node_name}.png"
-        image.save(im_path)
-        label_lines.append(f'<TR><TD><IMG SRC="{im_path}"/></TD></TR>')
-
-    for k, v in annots.items():
-        if v is not None and v != "":
-            if k:
-                label_lines.append(f"<TR><TD>{k}: {v}</TD></TR>")
-            else:
-                label_lines.append(f"<TR><TD>{v}</TD></TR>")
-
-    label_lines += ["</TABLE>", ">"]
-
-    return pydot.Node(
-        node_name,
-        shape="plaintext",
-        label="".join(label_lines),
-        fontsize="11",
-        fontname=fontname,
-    )
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the process pool shared by all renders, or None if it is disabled.
+
+    Workers are started via forkserver where available, else spawn: the pool is
+    created from the web server's threadpool, and forking a multi-threaded
+    process can deadlock. Both start methods re-import ``__main__`` in the
+    workers, so scripts that render more than one distinct molecule need an
+    ``if __name__ == "__main__":`` guard to benefit from the pool; without one
+    the pool fails to start and rendering falls back to running serially.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor_disabled:
+            return None
+        if _executor is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context(method))
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _get_executor() call builds a fresh one.
+
+    If the pool never completed a batch, it is disabled instead of rebuilt.
+    """
+    global _executor, _executor_disabled
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+            _executor_disabled = not _executor_has_worked
+    executor.shutdown(wait=False)
+
+
+def _collect_smiles(nodes: list[BuildingBlock | ReactionNode]) -> list[str]:
+    """Collect the distinct SMILES that will be drawn for a tree, in traversal order."""
+    smiles: dict[str, None] = {}
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node.KIND == BuildingBlock.KIND:
+            smiles[node.smiles] = None
+        elif node.KIND == ReactionNode.KIND:
+            if node.products:
+                smiles[node.products[0]] = None
+            stack.extend(reversed(node.reactants))
+    return list(smiles)
+
+
+def _render_in_pool(smiles: list[str], size: int, fmt: str) -> list[bytes | None] | None:
+    """Render SMILES on the process pool, or return None if the pool is unavailable or broke."""
+    global _executor_has_worked
+    executor = _get_executor()
+    if executor is None:
+        return None
+    try:
+        rendered = list(executor.map(_render_molecule, smiles, repeat(size), repeat(fmt)))
+    except BrokenProcessPool:
+        # A worker died (OOM kill, RDKit crash) or could not start; the caller renders serially
+        _discard_executor(executor)
+        return None
+    _executor_has_worked = True
+    return rendered
+
+
+def _draw_molecules(smiles: list[str], size: int, fmt: str) -> dict[str, bytes | None]:
+    """Render distinct SMILES, in parallel for cache misses. Returns a mapping from SMILES to image bytes."""
+    images: dict[str, bytes | None] = {}
+    misses: list[str] = []
+    for smi in smiles:
+        hit, image = _cache_lookup((smi, size, fmt))
+        if hit:
+            images[smi] = image
+        else:
+            misses.append(smi)
+
+    rendered = _render_in_pool(misses, size, fmt) if len(misses) > 1 else None
+    if rendered is None:
+        rendered = [_render_molecule(smi, size, fmt) for smi in misses]
+
+    for smi, image in zip(misses, rendered):
+        _cache_store((smi, size, fmt), image)
+        images[smi] = image
+    # Keep traversal order, which decides the image file names
+    return {smi: images[smi] for smi in smiles}
+
+
+# HTML-label templates for tree nodes: an optional molecule image followed by annotation rows
+_NODE_TEMPLATE = (
+    "{node_name} [shape=plaintext, label=<"
+    '<TABLE STYLE="ROUNDED" BORDER="0" CELLBORDER="0" CELLSPACING="5" CELLPADDING="0" BGCOLOR="grey97">'
+    "{image}{rows}</TABLE>>, fontsize=11, fontname={fontname}];"
+)
+_IMAGE_ROW = '<TR><TD><IMG SRC="{}"/></TD></TR>'
+_TEXT_ROW = "<TR><TD>{}</TD></TR>"
+_ID_ROW = "<TR><TD>ID: {}</TD></TR>"
+_REACTION_ROW = "<TR><TD>Reaction: {}</TD></TR>"
+
+
+def _quote(value: object) -> str:
+    """Quote a value as a DOT string literal."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _make_node(node_name: str, im_path: str | None, rows: str, dot_fontname: str) -> str:
+    """Create a DOT node statement with an HTML label containing an image and annotation rows.
+
+    ``dot_fontname`` must already be quoted with :func:`_quote`.
+    """
+    image = _IMAGE_ROW.format(im_path) if im_path is not None else ""
+    return _NODE_TEMPLATE.format(node_name=node_name, image=image, rows=rows, fontname=dot_fontname)
+
+
+def _run_dot(source: str, fmt: str) -> bytes:
+    """Lay out and render DOT source with the graphviz ``dot`` executable."""
+    result = subprocess.run(["dot", f"-T{fmt}"], input=source.encode(), capture_output=True, check=False)
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")
+        raise RuntimeError(f"dot failed with exit code {result.returncode}: {stderr}")
+    return result.stdout
 
 
 def draw_synthesis_tree(
@@ -71,64 +258,125 @@ def draw_synthesis_tree(
     rankdir: str = "LR",
     fontname: str = "Fira Sans",
     dpi: int = 200,
-) -> PIL.Image.Image:
-    """Render a list of synthesis tree roots as a directed graph PNG."""
-    counter = [0]
+    fmt: str = "png",
+) -> bytes:
+    """Render a list of synthesis tree roots as a directed graph.
+
+    Returns the graph as PNG or SVG bytes, depending on ``fmt``. SVG output
+    draws molecules as vector images too and embeds them as data URIs, so the
+    result is self-contained.
+    """
+    if fmt not in IMAGE_MEDIA_TYPES:
+        raise ValueError(f"Unsupported image format: {fmt!r}")
+    images = _draw_molecules(_collect_smiles(nodes), node_image_size, fmt)
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        graph = pydot.Dot(
-            "",
-            graph_type="digraph",
-            rankdir=rankdir,
-            fontname=fontname,
-            fontsize=8,
-            dpi=dpi,
-            bgcolor="transparent",
-            nodesep=0.02,
-        )
-
-        for root in nodes:
-            _add_node(graph, root, tmpdir, node_image_size, fontname, counter)
-
-        png_data = graph.create_png()
-        return PIL.Image.open(io.BytesIO(png_data))
-
-
-def _add_node(
-    graph: pydot.Dot,
-    node: BuildingBlock | ReactionNode,
-    tmpdir: str,
-    node_image_size: int,
+        # Graphviz only loads IMG sources from files, so each distinct molecule
+        # is written once and its path shared by every node that shows it
+        image_paths: dict[str, str] = {}
+        files: list[tuple[str, bytes]] = []
+        for i, (smi, image) in enumerate(images.items()):
+            if image is not None:
+                image_paths[smi] = f"{tmpdir}/m{i}.{fmt}"
+                files.append((image_paths[smi], image))
+        _write_files(files)
+
+        graph = [
+            "digraph {",
+            (
+                f"graph [rankdir={_quote(rankdir)}, fontname={_quote(fontname)}, fontsize=8, dpi={_quote(dpi)}, "
+                'bgcolor="transparent", nodesep=0.02];'
+            ),
+        ]
+
+        _add_nodes(graph, nodes, image_paths, fontname)
+        graph.append("}")
+        output = _run_dot("\n".join(graph), fmt)
+        if fmt == "svg":
+            # The SVG only links to the image files, which are deleted with tmpdir
+            output = _inline_images(output, files, IMAGE_MEDIA_TYPES[fmt])
+        else:
+            output = _quantize_png(output)
+        return output
+
+
+def _quantize_png(png_data: bytes) -> bytes:
+    """Re-encode an RGBA PNG as a palette PNG.
+
+    Graph renders are mostly flat background, grey edges and a few atom
+    colours, so the palette is visually lossless apart from slight banding in
+    anti-aliased edges, and the result is several times smaller.
+    """
+    img = PIL.Image.open(io.BytesIO(png_data)).convert("RGBA")
+    img = img.quantize(colors=_PNG_PALETTE_COLORS, method=PIL.Image.Quantize.FASTOCTREE)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=False, compress_level=1)
+    return buf.getvalue()
+
+
+def _inline_images(svg: bytes, files: list[tuple[str, bytes]], media_type: str) -> bytes:
+    """Replace references to image files in graphviz SVG output with data URIs."""
+    for path, data in files:
+        svg = svg.replace(path.encode(), f"data:{media_type};base64,".encode() + base64.b64encode(data))
+    return svg
+
+
+def _write_files(files: list[tuple[str, bytes]]) -> None:
+    """Write ``(path, data)`` pairs to disk in a single unbuffered pass."""
+    for path, data in files:
+        with open(path, "wb", buffering=0) as f:
+            f.write(data)
+
+
+def _add_nodes(
+    graph: list[str],
+    roots: list[BuildingBlock | ReactionNode],
+    image_paths: dict[str, str],
     fontname: str,
-    counter: list[int],
-) -> str:
-    """Recursively add a node and its children to the graph. Returns the node's ID."""
-    counter[0] += 1
-    node_id = f"n{counter[0]}"
-
-    if isinstance(node, BuildingBlock):
-        img = draw_molecule(node.smiles, size=node_image_size)
-        annots: dict[str, str | None] = {
-            "": node.bb_index,
-        }
-        if node.id:
-            annots["ID"] = node.id
-        graph.add_node(_make_node(tmpdir, node_id, img, annots, fontname))
-
-    elif isinstance(node, ReactionNode):
-        # Draw first product molecule if available
-        prod_img = None
-        if node.products:
-            prod_img = draw_molecule(node.products[0], size=node_image_size)
-
-        annots = {
-            "Reaction": node.rxn_index,
-        }
-        graph.add_node(_make_node(tmpdir, node_id, prod_img, annots, fontname))
-
-        # Recursively add reactants and connect edges
-        for reactant in node.reactants:
-            child_id = _add_node(graph, reactant, tmpdir, node_image_size, fontname, counter)
-            graph.add_edge(pydot.Edge(child_id, node_id, color="grey50"))
-
-    return node_id
+) -> None:
+    """Add each root and all of its descendants to the graph.
+
+    Walks the tree with an explicit stack so arbitrarily deep pathways cannot
+    hit the recursion limit. Nodes are numbered in pre-order.
+    """
+    # Entries are (node, parent node ID or None for roots)
+    stack: list[tuple[BuildingBlock | ReactionNode, str | None]] = [(root, None) for root in reversed(roots)]
+    counter = 0
+    dot_fontname = _quote(fontname)
+
+    while stack:
+        node, parent_id = stack.pop()
+        counter += 1
+        node_id = f"n{counter}"
+
+        im_path, rows = _NODE_LABELS[node.KIND](node, image_paths)
+        graph.append(_make_node(node_id, im_path, rows, dot_fontname))
+
+        if node.KIND == ReactionNode.KIND:
+            # Visit reactants next, in their original order
+            stack.extend((reactant, node_id) for reactant in reversed(node.reactants))
+
+        if parent_id is not None:
+            graph.append(f'{node_id} -> {parent_id} [color="grey50"];')
+
+
+def _building_block_label(node: BuildingBlock, image_paths: dict[str, str]) -> tuple[str | None, str]:
+    """Return the image path and annotation rows for a building block node."""
+    rows = _TEXT_ROW.format(node.bb_index) if node.bb_index else ""
+    if node.id:
+        rows += _ID_ROW.format(node.id)
+    return image_paths.get(node.smiles), rows
+
+
+def _reaction_label(node: ReactionNode, image_paths: dict[str, str]) -> tuple[str | None, str]:
+    """Return the image path (of the first product, if any) and annotation rows for a reaction node."""
+    im_path = image_paths.get(node.products[0]) if node.products else None
+    rows = _REACTION_ROW.format(node.rxn_index) if node.rxn_index else ""
+    return im_path, rows
+
+
+# Label builders keyed on the node's KIND tag
+_NODE_LABELS = {
+    BuildingBlock.KIND: _building_block_label,
+    ReactionNode.KIND: _reaction_label,
+}
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import ClassVar
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BuildingBlock:
+    KIND: ClassVar[str] = "bb"
+
     smiles: str
     bb_index: str
     id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ReactionNode:
+    KIND: ClassVar[str] = "rxn"
+
     rxn_index: str
     products: list[str] = field(default_factory=list)
     reactants: list[BuildingBlock | ReactionNode] = field(default_factory=list)
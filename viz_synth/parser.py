@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
-import re
-
 from .models import BuildingBlock, ReactionNode
 
+# A scanned input line: (indentation, stripped text)
+_Line = tuple[int, str]
+# Interning table for building blocks, keyed on (smiles, bb_index, id)
+_BuildingBlocks = dict[tuple[str, str, str | None], BuildingBlock]
+
+_SECTION_HEADERS = {"Possible Products:": "products", "Reactants:": "reactants"}
+
 
 def parse_synthesis(text: str) -> list[BuildingBlock | ReactionNode]:
     """Parse synthesis text into a list of root nodes.
@@ -13,9 +18,9 @@ def parse_synthesis(text: str) -> list[BuildingBlock | ReactionNode]:
     The text format is produced by prexsyn's ``synthesis_to_string()``.
     Top-level items are separated by being at the same base indentation level.
     """
-    lines = text.splitlines()
+    lines = _scan_lines(text)
     # Remove trailing empty lines
-    while lines and lines[-1].strip() == "":
+    while lines and lines[-1][1] == "":
         lines.pop()
     if not lines:
         return []
@@ -23,114 +28,147 @@ def parse_synthesis(text: str) -> list[BuildingBlock | ReactionNode]:
     # Find the minimum indentation of lines starting with "- "
     base_indent = _find_base_indent(lines)
 
-    # Split into top-level item blocks
-    blocks = _split_into_blocks(lines, base_indent)
+    return _SynthesisParser(lines).parse_items(base_indent, frozenset(), frozenset())
 
-    return [_parse_block(block, base_indent) for block in blocks]
 
+def _scan_lines(text: str) -> list[_Line]:
+    """Split text into lines, measuring indentation and stripping each line once."""
+    lines: list[_Line] = []
+    for line in text.splitlines():
+        unindented = line.lstrip()
+        lines.append((len(line) - len(unindented), unindented.rstrip()))
+    return lines
 
-def _find_base_indent(lines: list[str]) -> int:
+
+def _find_base_indent(lines: list[_Line]) -> int:
     """Find the indentation of the first line starting with '- '."""
-    for line in lines:
-        stripped = line.lstrip()
+    for indent, stripped in lines:
         if stripped.startswith("- "):
-            return len(line) - len(stripped)
+            return indent
     return 0
 
 
-def _split_into_blocks(lines: list[str], base_indent: int) -> list[list[str]]:
-    """Split lines into blocks, each starting with a '- ' at base_indent level."""
-    blocks: list[list[str]] = []
-    current_block: list[str] = []
-
-    for line in lines:
-        stripped = line.lstrip()
-        indent = len(line) - len(stripped)
-        # A new top-level item starts with "- " at exactly the base indent
-        if indent == base_indent and stripped.startswith("- ") and current_block:
-            blocks.append(current_block)
-            current_block = []
-        current_block.append(line)
-
-    if current_block:
-        blocks.append(current_block)
-
-    return blocks
-
-
-def _parse_block(lines: list[str], base_indent: int) -> BuildingBlock | ReactionNode:
-    """Parse a single block into a BuildingBlock or ReactionNode."""
-    first_line = lines[0].strip()
-
-    if first_line.startswith("- SMILES:"):
-        return _parse_building_block(lines)
-    elif first_line.startswith("- Reaction Index:"):
-        return _parse_reaction_node(lines, base_indent)
-    else:
-        raise ValueError(f"Unexpected block start: {first_line!r}")
-
-
-def _parse_building_block(lines: list[str]) -> BuildingBlock:
-    """Parse a building block from its lines."""
-    smiles = ""
-    bb_index = ""
-    bb_id = None
-
-    for line in lines:
-        stripped = line.strip()
-        if m := re.match(r"- SMILES:\s*(.+)", stripped):
-            smiles = m.group(1).strip()
-        elif m := re.match(r"Building Block Index:\s*(.+)", stripped):
-            bb_index = m.group(1).strip()
-        elif m := re.match(r"ID:\s*(.+)", stripped):
-            bb_id = m.group(1).strip()
-
-    return BuildingBlock(smiles=smiles, bb_index=bb_index, id=bb_id)
-
-
-def _parse_reaction_node(lines: list[str], base_indent: int) -> ReactionNode:
-    """Parse a reaction node, including nested reactants."""
-    first_line = lines[0].strip()
-    m = re.match(r"- Reaction Index:\s*(.+)", first_line)
-    if not m:
-        raise ValueError(f"Expected Reaction Index line, got: {first_line!r}")
-    rxn_index = m.group(1).strip()
-
-    # Find sections: Possible Products and Reactants
-    products: list[str] = []
-    reactants: list[BuildingBlock | ReactionNode] = []
-
-    section = None
-    # Section headers like "  Possible Products:" sit at base_indent + 2
-    header_indent = base_indent + 2
-    reactant_lines: list[str] = []
-    reactant_base_indent: int | None = None
-
-    for line in lines[1:]:
-        stripped = line.strip()
-        indent = len(line) - len(line.lstrip())
-
-        # Only detect section headers at the expected indentation for *this* node
-        if indent == header_indent and stripped == "Possible Products:":
-            section = "products"
-            continue
-        elif indent == header_indent and stripped == "Reactants:":
-            section = "reactants"
-            continue
-
-        if section == "products":
-            if m := re.match(r"- (.+)", stripped):
-                products.append(m.group(1).strip())
-        elif section == "reactants":
-            # Collect all reactant lines and parse them as sub-blocks
-            reactant_lines.append(line)
-            if reactant_base_indent is None and stripped.startswith("- "):
-                reactant_base_indent = indent
-
-    # Parse the collected reactant lines into sub-blocks
-    if reactant_lines and reactant_base_indent is not None:
-        sub_blocks = _split_into_blocks(reactant_lines, reactant_base_indent)
-        for block in sub_blocks:
-            reactants.append(_parse_block(block, reactant_base_indent))
-
-    return ReactionNode(rxn_index=rxn_index, products=products, reactants=reactants)
+def _field_value(stripped: str, prefix: str) -> str | None:
+    """Return the non-empty value following ``prefix`` on a stripped line, or None."""
+    if not stripped.startswith(prefix):
+        return None
+    return stripped[len(prefix) :].strip() or None
+
+
+def _at_boundary(line: _Line, block_starts: frozenset[int], header_indents: frozenset[int]) -> bool:
+    """Whether a line ends the enclosing block (see :class:`_SynthesisParser`)."""
+    indent, stripped = line
+    if stripped.startswith("- "):
+        return indent in block_starts
+    return indent in header_indents and stripped in _SECTION_HEADERS
+
+
+class _SynthesisParser:
+    """Single-pass recursive-descent parser over scanned lines.
+
+    Lines are consumed front to back with no re-splitting per nesting level;
+    only a block's terminating line is re-checked by its enclosing loops.
+    Where a block ends is decided by the enclosing context: a block stops at
+    the next ``- `` item at its own or any ancestor's item indentation
+    (``block_starts``), or at a section header of any ancestor reaction
+    (``header_indents``).
+    """
+
+    def __init__(self, lines: list[_Line]) -> None:
+        self.lines = lines
+        self.pos = 0
+        # Identical building blocks within one synthesis share a single instance
+        self.building_blocks: _BuildingBlocks = {}
+
+    def parse_items(
+        self, item_indent: int, block_starts: frozenset[int], header_indents: frozenset[int]
+    ) -> list[BuildingBlock | ReactionNode]:
+        """Parse consecutive items at ``item_indent`` until the enclosing block ends."""
+        item_starts = block_starts | {item_indent}
+        items = [self._parse_block(item_indent, item_starts, header_indents)]
+        while self.pos < len(self.lines) and not _at_boundary(self.lines[self.pos], block_starts, header_indents):
+            items.append(self._parse_block(item_indent, item_starts, header_indents))
+        return items
+
+    def _parse_block(
+        self, base_indent: int, block_starts: frozenset[int], header_indents: frozenset[int]
+    ) -> BuildingBlock | ReactionNode:
+        """Parse a single block into a BuildingBlock or ReactionNode."""
+        first_line = self.lines[self.pos][1]
+
+        if first_line.startswith("- SMILES:"):
+            return self._parse_building_block(block_starts, header_indents)
+        elif first_line.startswith("- Reaction Index:"):
+            return self._parse_reaction_node(base_indent, block_starts, header_indents)
+        else:
+            raise ValueError(f"Unexpected block start: {first_line!r}")
+
+    def _parse_building_block(self, block_starts: frozenset[int], header_indents: frozenset[int]) -> BuildingBlock:
+        """Parse a building block from its lines."""
+        smiles = ""
+        bb_index = ""
+        bb_id = None
+
+        lines = self.lines
+        # The first line is this block's own "- SMILES:" item start, not a boundary
+        start = self.pos
+        while self.pos < len(lines) and (
+            self.pos == start or not _at_boundary(lines[self.pos], block_starts, header_indents)
+        ):
+            stripped = lines[self.pos][1]
+            if (value := _field_value(stripped, "- SMILES:")) is not None:
+                smiles = value
+            elif (value := _field_value(stripped, "Building Block Index:")) is not None:
+                bb_index = value
+            elif (value := _field_value(stripped, "ID:")) is not None:
+                bb_id = value
+            self.pos += 1
+
+        key = (smiles, bb_index, bb_id)
+        bb = self.building_blocks.get(key)
+        if bb is None:
+            bb = self.building_blocks[key] = BuildingBlock(smiles=smiles, bb_index=bb_index, id=bb_id)
+        return bb
+
+    def _parse_reaction_node(
+        self, base_indent: int, block_starts: frozenset[int], header_indents: frozenset[int]
+    ) -> ReactionNode:
+        """Parse a reaction node, including nested reactants."""
+        first_line = self.lines[self.pos][1]
+        rxn_index = _field_value(first_line, "- Reaction Index:")
+        if rxn_index is None:
+            raise ValueError(f"Expected Reaction Index line, got: {first_line!r}")
+        self.pos += 1
+
+        products: list[str] = []
+        reactants: list[BuildingBlock | ReactionNode] = []
+
+        section = None
+        # Section headers like "  Possible Products:" sit at base_indent + 2
+        header_indent = base_indent + 2
+        reactant_header_indents = header_indents | {header_indent}
+        # First stray line in the reactants section before any reactant item
+        stray_line: str | None = None
+
+        lines = self.lines
+        while self.pos < len(lines) and not _at_boundary(lines[self.pos], block_starts, header_indents):
+            indent, stripped = lines[self.pos]
+
+            # Only detect section headers at the expected indentation for *this* node
+            if indent == header_indent and stripped in _SECTION_HEADERS:
+                section = _SECTION_HEADERS[stripped]
+            elif section == "products":
+                if (value := _field_value(stripped, "- ")) is not None:
+                    products.append(value)
+            elif section == "reactants":
+                if stripped.startswith("- "):
+                    if stray_line is not None:
+                        raise ValueError(f"Unexpected block start: {stray_line!r}")
+                    # Reactants are items at this line's indentation, parsed in place
+                    reactants += self.parse_items(indent, block_starts, reactant_header_indents)
+                    continue
+                if stray_line is None and not reactants:
+                    stray_line = stripped
+            self.pos += 1
+
+        return ReactionNode(rxn_index=rxn_index, products=products, reactants=reactants)